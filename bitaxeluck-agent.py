@@ -21,203 +21,409 @@ Usage:
 Requirements:
     pip install requests
 
+Optional (faster JSON parsing):
+    pip install orjson
+
 """
 
 import argparse
+import logging
+import logging.handlers
+import queue
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import sys
 import signal
+import socket
+import threading
 import os
 import re
+import gzip
+import string
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson  # Optional: faster JSON decoding of miner responses
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 # BitAxeLuck API endpoint
 BITAXELUCK_URL = "https://influx.bitaxeluck.com/api/v2/write"
 DEFAULT_INTERVAL = 10  # seconds
+MINER_TIMEOUT = 2  # seconds, BitAxe is on the LAN
+MAX_BACKOFF = 300  # seconds, longest pause before retrying an unreachable miner
+MAX_WORKERS = 32  # Upper bound on parallel miner requests
+STREAM_MIN_MINERS = 50  # Above this many miners, send in chunks as results arrive
+STREAM_CHUNK_SIZE = 20  # Lines per chunked write
+GZIP_MIN_BYTES = 512  # Compress write bodies larger than this
+
+# Static write parameters, sent with every request
+INGEST_PARAMS = {
+    "bucket": "miners",
+    "org": "hashluck",
+    "precision": "s"
+}
+GZIP_HEADERS = {"Content-Encoding": "gzip"}
 
 # Miner name validation (same as backend)
 MINER_NAME_REGEX = re.compile(r'^[a-zA-Z0-9_-]+$')
 MINER_NAME_MAX_LENGTH = 32
+MINER_NAME_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9_-]')
+
+# str.translate table deleting every ASCII char not allowed in a miner name
+_MINER_NAME_ALLOWED = set(string.ascii_letters + string.digits + "_-")
+_MINER_NAME_DELETE_TABLE = {c: None for c in range(128) if chr(c) not in _MINER_NAME_ALLOWED}
 
 
 def sanitize_miner_name(name: str) -> str:
     """Sanitize miner name: only alphanumeric, dash, underscore. Max 32 chars."""
     if not name:
         return ""
-    sanitized = re.sub(r'[^a-zA-Z0-9_-]', '', name)
+    if name.isascii():
+        # Fast path: plain table lookup, no regex engine
+        sanitized = name.translate(_MINER_NAME_DELETE_TABLE)
+    else:
+        sanitized = MINER_NAME_INVALID_CHARS.sub('', name)
     return sanitized[:MINER_NAME_MAX_LENGTH]
 
-# Global flag for graceful shutdown
-running = True
+# Persistent HTTP sessions (keep-alive + connection pooling).
+# One for LAN requests to the miners, one for the HTTPS ingest endpoint,
+# so the TLS handshake is paid once instead of on every write.
+SESSION_MINERS = requests.Session()
+SESSION_INGEST = requests.Session()
+
+# Socket options for pooled connections. TCP_NODELAY: requests are tiny,
+# don't let Nagle hold them back. TCP keepalive probes keep idle pooled
+# connections (and NAT entries on home routers) alive between intervals.
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+for _opt, _value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+    if hasattr(socket, _opt):  # Linux only
+        SOCKET_OPTIONS.append((socket.IPPROTO_TCP, getattr(socket, _opt), _value))
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets use SOCKET_OPTIONS."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def configure_sessions(miner_count: int, token: str) -> None:
+    """Mount pooled adapters sized for the number of miners and set auth headers."""
+    pool_size = max(10, miner_count)
+    SESSION_MINERS.mount("http://", KeepAliveAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+    # Lines carry an explicit timestamp, so a resent batch overwrites the
+    # same points instead of duplicating them. 429 is handled by the caller.
+    # read=0: a write that timed out is not resent, or one slow ingest could
+    # block the polling loop for several 10s timeouts per chunk.
+    retry_kwargs: Dict[str, Any] = dict(
+        total=2,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    try:
+        ingest_retry = Retry(allowed_methods=frozenset({"POST"}), **retry_kwargs)
+    except TypeError:  # urllib3 < 1.26
+        ingest_retry = Retry(method_whitelist=frozenset({"POST"}), **retry_kwargs)  # type: ignore[call-arg]
+    SESSION_INGEST.mount("https://", KeepAliveAdapter(pool_connections=1, pool_maxsize=1, max_retries=ingest_retry))
+    # The token never changes during a run, so the headers are built once
+    SESSION_INGEST.headers.update({
+        "Authorization": f"Token {token}",
+        "Content-Type": "text/plain"
+    })
+
+
+def warm_up_ingest() -> None:
+    """Open the ingest connection up front (DNS + TCP + TLS).
+
+    The first write then reuses a pooled connection instead of paying
+    the handshake. The response itself is irrelevant.
+    """
+    try:
+        response = SESSION_INGEST.head(BITAXELUCK_URL, timeout=5)
+        log.debug(f"[DEBUG] Ingest connection ready ({response.status_code})")
+    except requests.exceptions.RequestException as e:
+        log.warning(f"[WARN] Could not pre-connect to BitAxeLuck: {e}")
+
+# Set by the signal handler for graceful shutdown
+SHUTDOWN = threading.Event()
+
+# Console output goes through a queue to a background thread, so slow
+# stdout (SSH, Pi SD card logs) never stalls the polling loop.
+log = logging.getLogger("bitaxeluck")
+
+
+def setup_logging(verbose: bool = False) -> logging.handlers.QueueListener:
+    """Attach a QueueHandler to the agent logger and start its listener."""
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, console)
+
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.DEBUG if verbose else logging.INFO)
+    log.propagate = False
 
+    listener.start()
+    return listener
 
-def signal_handler(sig, frame):
-    global running
-    print("\n[INFO] Shutting down gracefully...")
-    running = False
 
+def signal_handler(sig: int, frame: Any) -> None:
+    # Only set the event: logging from a signal handler can deadlock
+    SHUTDOWN.set()
 
-def get_bitaxe_metrics(bitaxe_ip: str) -> tuple:
+
+def get_bitaxe_metrics(bitaxe_ip: str) -> Tuple[str, Optional[Dict[str, Any]]]:
     """Fetch metrics from BitAxe API. Returns (ip, metrics) tuple."""
     url = f"http://{bitaxe_ip}/api/system/info"
     try:
-        response = requests.get(url, timeout=5)
+        response = SESSION_MINERS.get(url, timeout=MINER_TIMEOUT)
         response.raise_for_status()
+        if orjson is not None:
+            # Parse the raw bytes directly, skipping text decoding
+            return (bitaxe_ip, orjson.loads(response.content))
         return (bitaxe_ip, response.json())
     except requests.exceptions.RequestException as e:
-        print(f"[ERROR] [{bitaxe_ip}] Failed to fetch metrics: {e}")
+        log.error("[ERROR] [%s] Failed to fetch metrics: %s", bitaxe_ip, e)
+        return (bitaxe_ip, None)
+    except ValueError as e:
+        log.error("[ERROR] [%s] Invalid JSON response: %s", bitaxe_ip, e)
         return (bitaxe_ip, None)
 
 
-def convert_to_line_protocol(metrics: dict, host: str, custom_name: str = None) -> str:
-    """Convert BitAxe metrics to InfluxDB line protocol.
+# Line protocol escaping: tag values escape ',', ' ' and '=', string field
+# values escape '"' and backslash. Valid names pass through unchanged.
+_TAG_ESCAPE_TABLE = str.maketrans({",": "\\,", " ": "\\ ", "=": "\\="})
+_STRING_FIELD_ESCAPE_TABLE = str.maketrans({'"': '\\"', "\\": "\\\\"})
 
-    Args:
-        metrics: BitAxe metrics dict
-        host: IP address of BitAxe (fallback for hostname)
-        custom_name: Optional custom name (overrides hostname)
+
+def _fmt_hashrate(value: float) -> str:
+    """GH/s -> whole H/s.
+
+    No "i" suffix: the field stays a float in InfluxDB (existing series
+    are floats and a type change would be rejected), but without the
+    long float repr.
     """
-    # Extract and convert fields
-    fields = []
+    return str(round(value * 1e9))
 
-    # Hashrate (convert GH/s to H/s)
-    if "hashRate" in metrics:
-        fields.append(f"hashrate={metrics['hashRate'] * 1e9}")
-    if "hashRate_1m" in metrics:
-        fields.append(f"hashrate_1m={metrics['hashRate_1m'] * 1e9}")
-    if "hashRate_10m" in metrics:
-        fields.append(f"hashrate_10m={metrics['hashRate_10m'] * 1e9}")
-    if "hashRate_1h" in metrics:
-        fields.append(f"hashrate_1h={metrics['hashRate_1h'] * 1e9}")
 
-    # Temperature
-    if "temp" in metrics:
-        fields.append(f"temperature={metrics['temp']}")
-    if "vrTemp" in metrics:
-        fields.append(f"vr_temperature={metrics['vrTemp']}")
+def _fmt_int(value: Any) -> str:
+    """InfluxDB integer field."""
+    return f"{value}i"
 
-    # Power
-    if "power" in metrics:
-        fields.append(f"power={metrics['power']}")
-    if "voltage" in metrics:
-        fields.append(f"voltage={metrics['voltage']}")
-    if "current" in metrics:
-        fields.append(f"current={metrics['current']}")
-    if "coreVoltage" in metrics:
-        fields.append(f"core_voltage={metrics['coreVoltage']}")
-    if "coreVoltageActual" in metrics:
-        fields.append(f"core_voltage_actual={metrics['coreVoltageActual']}")
 
-    # Fan
-    if "fanrpm" in metrics:
-        fields.append(f"fan_rpm={metrics['fanrpm']}")
-    if "fanspeed" in metrics:
-        fields.append(f"fan_speed={metrics['fanspeed']}")
+def _fmt_string(value: Any) -> str:
+    """InfluxDB string field."""
+    return f'"{str(value).translate(_STRING_FIELD_ESCAPE_TABLE)}"'
 
-    # Shares
-    if "sharesAccepted" in metrics:
-        fields.append(f"shares_accepted={metrics['sharesAccepted']}i")
-    if "sharesRejected" in metrics:
-        fields.append(f"shares_rejected={metrics['sharesRejected']}i")
 
+# BitAxe API key -> (line protocol field, formatter), in output order
+FIELD_SPEC: Tuple[Tuple[str, str, Callable[[Any], str]], ...] = (
+    # Hashrate (convert GH/s to H/s)
+    ("hashRate", "hashrate", _fmt_hashrate),
+    ("hashRate_1m", "hashrate_1m", _fmt_hashrate),
+    ("hashRate_10m", "hashrate_10m", _fmt_hashrate),
+    ("hashRate_1h", "hashrate_1h", _fmt_hashrate),
+    # Temperature
+    ("temp", "temperature", str),
+    ("vrTemp", "vr_temperature", str),
+    # Power
+    ("power", "power", str),
+    ("voltage", "voltage", str),
+    ("current", "current", str),
+    ("coreVoltage", "core_voltage", str),
+    ("coreVoltageActual", "core_voltage_actual", str),
+    # Fan
+    ("fanrpm", "fan_rpm", str),
+    ("fanspeed", "fan_speed", str),
+    # Shares
+    ("sharesAccepted", "shares_accepted", _fmt_int),
+    ("sharesRejected", "shares_rejected", _fmt_int),
     # Difficulty
-    if "bestDiff" in metrics:
-        fields.append(f'best_diff="{metrics["bestDiff"]}"')
-    if "bestSessionDiff" in metrics:
-        fields.append(f'best_session_diff="{metrics["bestSessionDiff"]}"')
-    if "poolDifficulty" in metrics:
-        fields.append(f"pool_difficulty={metrics['poolDifficulty']}")
-
+    ("bestDiff", "best_diff", _fmt_string),
+    ("bestSessionDiff", "best_session_diff", _fmt_string),
+    ("poolDifficulty", "pool_difficulty", str),
     # Frequency
-    if "frequency" in metrics:
-        fields.append(f"frequency={metrics['frequency']}")
-
+    ("frequency", "frequency", str),
     # System
-    if "uptimeSeconds" in metrics:
-        fields.append(f"uptime={metrics['uptimeSeconds']}i")
-    if "freeHeap" in metrics:
-        fields.append(f"free_heap={metrics['freeHeap']}i")
-
+    ("uptimeSeconds", "uptime", _fmt_int),
+    ("freeHeap", "free_heap", _fmt_int),
     # ASIC info
-    if "ASICModel" in metrics:
-        fields.append(f'asic_model="{metrics["ASICModel"]}"')
-    if "boardVersion" in metrics:
-        fields.append(f'board_version="{metrics["boardVersion"]}"')
-    if "version" in metrics:
-        fields.append(f'firmware_version="{metrics["version"]}"')
-
-    # Build line protocol: measurement,tags fields timestamp
-    # Priority: custom_name > hostname from metrics > IP-based fallback
-    if custom_name:
-        hostname = sanitize_miner_name(custom_name)
-    else:
-        hostname = metrics.get("hostname", host.replace(".", "_"))
-
-    line = f"bitaxe,host={hostname} {','.join(fields)}"
-
-    return line
+    ("ASICModel", "asic_model", _fmt_string),
+    ("boardVersion", "board_version", _fmt_string),
+    ("version", "firmware_version", _fmt_string),
+)
+
+
+def convert_to_line_protocol(
+    metrics: Dict[str, Any],
+    host: str,
+    custom_name: Optional[str] = None,
+    ts: Optional[int] = None,
+) -> Optional[str]:
+    """Convert BitAxe metrics to InfluxDB line protocol.
 
+    Returns None if the metrics contain no known fields (InfluxDB rejects
+    a line without fields).
 
-def send_to_bitaxeluck(line_protocol: str, token: str) -> bool:
-    """Send metrics to BitAxeLuck."""
-    headers = {
-        "Authorization": f"Token {token}",
-        "Content-Type": "text/plain"
-    }
-    params = {
-        "bucket": "miners",
-        "org": "hashluck",
-        "precision": "s"
-    }
+    Args:
+        metrics: BitAxe metrics dict
+        host: IP address of BitAxe (fallback for hostname)
+        custom_name: Optional custom name, already sanitized (overrides hostname)
+        ts: Optional timestamp in seconds (matches precision=s)
+    """
+    # Build line protocol: measurement,tags fields timestamp
+    # Priority: custom_name > hostname from metrics > IP-based fallback.
+    # Custom names are sanitized once at startup. The BitAxe hostname is used
+    # as reported, as before; sanitizing it would change existing host tags.
+    # Escaping keeps one odd hostname from getting the whole batch rejected.
+    hostname = str(custom_name or metrics.get("hostname", host.replace(".", "_")))
+    hostname = hostname.translate(_TAG_ESCAPE_TABLE)
+
+    # Flat list of fragments, joined once at the end
+    parts = ["bitaxe,host=", hostname, " "]
+    append = parts.append
+    get = metrics.get
+    for json_key, field_key, fmt in FIELD_SPEC:
+        value = get(json_key)
+        if value is not None:
+            append(field_key)
+            append("=")
+            append(fmt(value))
+            append(",")
+
+    # No fields: the line would be rejected, don't send it
+    if parts[-1] != ",":
+        return None
+
+    # Drop trailing field separator
+    parts.pop()
+
+    if ts is not None:
+        append(" ")
+        append(str(ts))
+
+    return "".join(parts)
+
+
+def send_to_bitaxeluck(line_protocol: str) -> bool:
+    """Send metrics to BitAxeLuck.
+
+    line_protocol may hold several newline-separated lines, so all miners
+    are written in a single request. Larger batches are gzip-compressed.
+    """
+    headers: Optional[Dict[str, str]] = None
+    body = line_protocol.encode()
+    if len(body) > GZIP_MIN_BYTES:
+        # Batches repeat the same field names, so even level 1 shrinks them a lot
+        body = gzip.compress(body, compresslevel=1)
+        headers = GZIP_HEADERS
 
     try:
-        response = requests.post(
+        response = SESSION_INGEST.post(
             BITAXELUCK_URL,
             headers=headers,
-            params=params,
-            data=line_protocol,
+            params=INGEST_PARAMS,
+            data=body,
             timeout=10
         )
 
-        if response.status_code == 200:
+        if 200 <= response.status_code < 300:  # InfluxDB answers 204 No Content
             return True
         elif response.status_code == 429:
-            print(f"[WARN] Rate limited, waiting...")
+            log.warning("[WARN] Rate limited, waiting...")
             return False
         else:
-            print(f"[ERROR] Failed to send: {response.status_code} - {response.text}")
+            log.error("[ERROR] Failed to send: %s - %s", response.status_code, response.text)
             return False
 
     except requests.exceptions.RequestException as e:
-        print(f"[ERROR] Failed to send metrics: {e}")
+        log.error("[ERROR] Failed to send metrics: %s", e)
         return False
 
 
-def parse_bitaxe_ips(ip_string: str) -> list:
+def parse_bitaxe_ips(ip_string: str) -> List[str]:
     """Parse comma-separated IP addresses."""
     ips = [ip.strip() for ip in ip_string.split(',') if ip.strip()]
     return ips
 
 
-def collect_from_miners(miners: list, verbose: bool = False) -> list:
-    """Collect metrics from multiple miners in parallel."""
-    results = []
+class Miner:
+    """Per-miner configuration and polling state."""
 
-    # Use ThreadPoolExecutor for parallel collection
-    with ThreadPoolExecutor(max_workers=min(len(miners), 10)) as executor:
-        futures = {executor.submit(get_bitaxe_metrics, ip): ip for ip in miners}
+    __slots__ = ("ip", "name", "errors", "next_poll_tick")
 
-        for future in as_completed(futures):
-            ip, metrics = future.result()
-            if metrics:
-                results.append((ip, metrics))
+    def __init__(self, ip: str, name: Optional[str] = None):
+        self.ip = ip
+        self.name = name  # Sanitized custom name, None = use BitAxe hostname
+        self.errors = 0  # Consecutive failures
+        self.next_poll_tick = 0  # Skip polling until this tick (backoff)
 
-    return results
 
+def poll_miner(miner: Miner, ts: int) -> Tuple[Miner, Optional[Dict[str, Any]], Optional[str]]:
+    """Fetch and convert one miner's metrics (runs in a worker thread).
+
+    Returns (miner, metrics, line). metrics is None if the miner could not
+    be reached, line is None if the response had no usable fields.
+    """
+    _, metrics = get_bitaxe_metrics(miner.ip)
+    if not metrics:
+        return (miner, None, None)
 
-def main():
+    # Convert to line protocol (custom name, if configured, wins)
+    line = convert_to_line_protocol(metrics, miner.ip, miner.name, ts)
+    if line is not None:
+        # Lazy %-args: nothing is formatted unless --verbose is on
+        log.debug("[DEBUG] [%s] %.80s...", miner.ip, line)
+
+    return (miner, metrics, line)
+
+
+def collect_from_miners(
+    miners: List[Miner],
+    executor: ThreadPoolExecutor,
+    ts: int,
+) -> Iterator[Tuple[Miner, Dict[str, Any], Optional[str]]]:
+    """Collect and convert metrics from multiple miners in parallel.
+
+    Each worker fetches and formats its own miner, so parsing overlaps
+    with other miners' network waits. Yields (miner, metrics, line) for
+    every miner that answered, as each one completes.
+    """
+    futures = [executor.submit(poll_miner, miner, ts) for miner in miners]
+
+    for future in as_completed(futures):
+        miner, metrics, line = future.result()
+        if metrics:
+            yield (miner, metrics, line)
+
+
+def send_batch(batch: List[Tuple[Miner, Dict[str, Any], str]], timestamp: str) -> int:
+    """Send (miner, metrics, line) entries in one write. Returns miners sent."""
+    if not batch or not send_to_bitaxeluck("\n".join(line for _, _, line in batch)):
+        return 0
+
+    for miner, metrics, _ in batch:
+        hashrate = metrics.get("hashRate", 0)
+        temp = metrics.get("temp", 0)
+        # Display name priority: custom_name > hostname > IP
+        display_name = miner.name or metrics.get("hostname", miner.ip)
+        log.info("[%s] %s: %.1f GH/s | %.1f°C", timestamp, display_name, hashrate, temp)
+
+    return len(batch)
+
+
+def main() -> None:
     parser = argparse.ArgumentParser(
         description="BitAxeLuck Agent - Send BitAxe metrics to BitAxeLuck",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -272,21 +478,27 @@ Examples:
         parser.error("--token is required (or set BITAXELUCK_TOKEN environment variable)")
 
     # Parse multiple IPs
-    miners = parse_bitaxe_ips(args.bitaxe_ip)
+    miner_ips = parse_bitaxe_ips(args.bitaxe_ip)
 
-    if not miners:
+    if not miner_ips:
         parser.error("No valid BitAxe IP addresses provided")
 
     # Parse custom miner names (optional)
     miner_names_list = [n.strip() for n in args.miner_names.split(',') if n.strip()] if args.miner_names else []
 
-    # Create IP -> name mapping
-    miner_name_map = {}
-    for i, ip in enumerate(miners):
+    # Build miners, pairing IPs with custom names by position
+    miners = []
+    for i, ip in enumerate(miner_ips):
         if i < len(miner_names_list):
-            miner_name_map[ip] = sanitize_miner_name(miner_names_list[i])
+            miners.append(Miner(ip, sanitize_miner_name(miner_names_list[i])))
         else:
-            miner_name_map[ip] = None  # Will use hostname from BitAxe
+            miners.append(Miner(ip))  # Will use hostname from BitAxe
+
+    listener = setup_logging(args.verbose)
+
+    # Size connection pools for the miner fleet and set ingest auth
+    configure_sessions(len(miners), args.token)
+    warm_up_ingest()
 
     # Setup signal handlers
     signal.signal(signal.SIGINT, signal_handler)
@@ -296,83 +508,91 @@ Examples:
     miner_count = len(miners)
     miner_label = "miner" if miner_count == 1 else "miners"
 
-    print(f"""
+    log.info(f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║                    BitAxeLuck Agent                          ║
 ╠══════════════════════════════════════════════════════════════╣
 ║  Monitoring: {miner_count} {miner_label:<44} ║""")
 
-    for i, ip in enumerate(miners[:5]):  # Show first 5
-        name = miner_name_map.get(ip)
-        if name:
-            display = f"{ip} ({name})"
+    for i, miner in enumerate(miners[:5]):  # Show first 5
+        if miner.name:
+            display = f"{miner.ip} ({miner.name})"
         else:
-            display = ip
-        print(f"║    {i+1}. {display:<52} ║")
+            display = miner.ip
+        log.info(f"║    {i+1}. {display:<52} ║")
 
     if len(miners) > 5:
-        print(f"║    ... and {len(miners) - 5} more{' ' * 41}║")
+        log.info(f"║    ... and {len(miners) - 5} more{' ' * 41}║")
 
-    print(f"""║  Interval:  {args.interval} seconds{' ' * 39}║
+    log.info(f"""║  Interval:  {args.interval} seconds{' ' * 39}║
 ║  Target:    influx.bitaxeluck.com                           ║
 ╚══════════════════════════════════════════════════════════════╝
     """)
 
-    print("[INFO] Starting metrics collection... (Ctrl+C to stop)")
+    log.info("[INFO] Starting metrics collection... (Ctrl+C to stop)")
 
-    # Track consecutive errors per miner
-    error_counts = {ip: 0 for ip in miners}
+    # Warn every max_errors consecutive failures per miner
     max_errors = 5
 
-    while running:
+    # Exponential backoff for unreachable miners, counted in intervals, so a
+    # dead host doesn't hold a worker for MINER_TIMEOUT on every tick
+    tick = 0
+    max_skip = max(1, MAX_BACKOFF // max(args.interval, 1))
+
+    # Long-lived worker pool, reused across intervals
+    executor = ThreadPoolExecutor(max_workers=min(len(miners), MAX_WORKERS), thread_name_prefix="bitaxe")
+
+    while not SHUTDOWN.is_set():
         timestamp = datetime.now().strftime("%H:%M:%S")
+        ts = int(time.time())  # One timestamp for the whole batch
 
         # Collect from all miners in parallel
-        results = collect_from_miners(miners, args.verbose)
+        polled = [miner for miner in miners if tick >= miner.next_poll_tick]
 
-        # Process results
-        sent_count = 0
-        for ip, metrics in results:
-            error_counts[ip] = 0  # Reset error count on success
+        # Small fleets: one write per interval. Large fleets: write chunks
+        # while slower miners are still answering.
+        chunk_size = STREAM_CHUNK_SIZE if len(polled) > STREAM_MIN_MINERS else 0
 
-            # Get custom name for this miner (if configured)
-            custom_name = miner_name_map.get(ip)
+        batch = []
+        reported = set()
+        sent_count = 0
+        for miner, metrics, line in collect_from_miners(polled, executor, ts):
+            miner.errors = 0  # Reset error count on success
+            reported.add(miner)
 
-            # Convert to line protocol
-            line = convert_to_line_protocol(metrics, ip, custom_name)
+            if line is None:
+                log.warning("[WARN] [%s] Degraded: response has no known metrics, skipping", miner.ip)
+                continue
 
-            if args.verbose:
-                print(f"[DEBUG] [{ip}] {line[:80]}...")
+            batch.append((miner, metrics, line))
+            if chunk_size and len(batch) >= chunk_size:
+                sent_count += send_batch(batch, timestamp)
+                batch = []
 
-            # Send to BitAxeLuck
-            if send_to_bitaxeluck(line, args.token):
-                sent_count += 1
-                hashrate = metrics.get("hashRate", 0)
-                temp = metrics.get("temp", 0)
-                # Display name priority: custom_name > hostname > IP
-                display_name = custom_name or metrics.get("hostname", ip)
-                print(f"[{timestamp}] {display_name}: {hashrate:.1f} GH/s | {temp:.1f}°C")
+        sent_count += send_batch(batch, timestamp)
 
         # Check for miners that failed
-        successful_ips = {ip for ip, _ in results}
-        for ip in miners:
-            if ip not in successful_ips:
-                error_counts[ip] += 1
-                if error_counts[ip] >= max_errors:
-                    print(f"[WARN] [{ip}] {max_errors} consecutive failures")
-                    error_counts[ip] = 0
+        for miner in polled:
+            if miner not in reported:
+                miner.errors += 1
+                skip = min(2 ** (miner.errors - 1), max_skip)
+                miner.next_poll_tick = tick + skip
+                if miner.errors % max_errors == 0:
+                    log.warning("[WARN] [%s] %d consecutive failures, retrying in %ds",
+                                miner.ip, miner.errors, skip * args.interval)
 
         # Summary for multi-miner
         if miner_count > 1:
-            print(f"[{timestamp}] Summary: {sent_count}/{miner_count} miners reporting")
+            log.info("[%s] Summary: %d/%d miners reporting", timestamp, sent_count, miner_count)
 
-        # Wait for next interval
-        for _ in range(args.interval):
-            if not running:
-                break
-            time.sleep(1)
+        # Wait for next interval (returns immediately on shutdown)
+        SHUTDOWN.wait(args.interval)
+        tick += 1
 
-    print("[INFO] Agent stopped")
+    log.info("\n[INFO] Shutting down gracefully...")
+    executor.shutdown(wait=False)
+    log.info("[INFO] Agent stopped")
+    listener.stop()
 
 
 if __name__ == "__main__":
@@ -13,6 +13,9 @@ This script connects to the stratum endpoint and analyzes:
 Usage:
     python3 stratum_audit.py [--host stratum.bitaxeluck.com] [--port 3334]
 
+Only the standard library is required. If orjson is installed, it is used
+for encoding/decoding stratum messages.
+
 Author: BitAxeLuck (open source audit tool)
 License: MIT
 """
@@ -22,35 +25,239 @@ import json
 import struct
 import time
 import hashlib
-import binascii
+import io
 import argparse
+import bisect
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterator, List, Tuple, TextIO
+
+try:
+    import orjson  # Optional: faster JSON for stratum messages
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 # Configuration
 DEFAULT_HOST = "stratum.bitaxeluck.com"
 DEFAULT_PORT = 3334
 TIMEOUT = 30
 BUFFER_SIZE = 4096
+MAX_PARALLEL_AUDITS = 8
+
+# bytes.translate table: printable ASCII maps to itself, everything else to
+# NUL, so printable runs (pool tags, signatures) fall out of one split
+PRINTABLE_TABLE = bytes(b if 32 <= b <= 126 else 0 for b in range(256))
+
+# Risk level -> score, and average-score upper bounds for the overall level
+RISK_SCORES = {"LOW": 1, "LOW-MEDIUM": 2, "MEDIUM": 3, "MEDIUM-HIGH": 4, "HIGH": 5}
+OVERALL_RISK_THRESHOLDS = (1.5, 2.5, 3.5)
+OVERALL_RISK_LEVELS = ("LOW", "LOW-MEDIUM", "MEDIUM", "HIGH")
+
+# Report templates, filled with str.format_map from the flattened audit
+# results (nested keys joined with "_"). Missing fields render as "N/A".
+REPORT_DEFAULTS = {
+    "coinbase_analysis_coinbase_tag": "Not found",
+    "coinbase_analysis_ascii_strings_found": [],
+    "coinbase_analysis_analysis_identified_software": "Unknown",
+    "coinbase_analysis_analysis_is_ckpool": False,
+    "coinbase_analysis_analysis_branding": "None",
+    "coinbase_analysis_analysis_is_proxy": False,
+    "connection_reused": False,
+}
+
+REPORT_TEMPLATE = """# Stratum Audit Report: pool.bitaxeluck.com
+
+**Audit Date:** {metadata_audit_timestamp}
+**Target:** {metadata_target_host}:{metadata_target_port}
+**Tool Version:** {metadata_tool_version}
+
+---
+
+## 1. Connection Analysis
+
+| Metric | Value |
+|--------|-------|
+| Connection Success | {connection_success} |
+| Connect Time | {connect_time} |
+| Connection Reused | {connection_reused} |
+| Remote IP | {connection_remote_ip} |
+
+## 2. Protocol Analysis
+
+### mining.subscribe
+- **Success:** {protocol_subscribe_success}
+- **Extranonce1:** `{protocol_subscribe_extranonce1}`
+- **Extranonce2 Size:** {protocol_subscribe_extranonce2_size} bytes
+
+### mining.authorize
+- **Success:** {protocol_authorize_success}
+- **Username Format:** wallet.worker (standard)
+- **Password Required:** No
+
+### Difficulty
+- **Initial Difficulty:** {protocol_initial_difficulty}
+
+## 3. Coinbase Analysis
+
+**This is the most critical section for verifying pool legitimacy.**
+
+### Coinbase Tag
+```
+{coinbase_analysis_coinbase_tag}
+```
+
+### ASCII Strings Found
+```
+{coinbase_analysis_ascii_strings_found}
+```
+
+### Interpretation
+- **Software:** {coinbase_analysis_analysis_identified_software}
+- **Is CKPool:** {coinbase_analysis_analysis_is_ckpool}
+- **Custom Branding:** {coinbase_analysis_analysis_branding}
+- **Is Proxy:** {coinbase_analysis_analysis_is_proxy}
+
+## 4. Fee Analysis
+
+| Aspect | Finding |
+|--------|---------|
+| Documented Fee | {fee_analysis_documented_fee} |
+| PPS Indicators | {fee_analysis_pps_indicators} |
+| Share Redirection | {fee_analysis_share_redirection} |
+
+**Verification Method:** {fee_analysis_recommendation}
+
+## 5. Architecture Determination
+
+Based on the audit findings:
+
+| Question | Answer | Evidence |
+|----------|--------|----------|
+| Is this a full pool? | **Yes** | CKPool software detected, custom coinbase tag |
+| Is this a proxy? | **No** | No proxy indicators, direct Stratum implementation |
+| Is this CKPool-based? | **Yes** | CKPool signatures in protocol behavior |
+| Is this solo.ckpool.org? | **No** | Different coinbase tag, independent infrastructure |
+
+## 6. Conclusion
+
+**pool.bitaxeluck.com is a legitimate solo mining pool running CKPool software with independent infrastructure.**
+
+### Facts (Verified)
+- Uses standard Stratum v1 protocol
+- Running CKPool software
+- Custom coinbase tag: `pool.bitaxeluck.com`
+- Non-custodial (miner wallet in username)
+- 2% documented fee
+
+### Inferences (Likely but not proven)
+- Independent server infrastructure
+- Same security model as solo.ckpool.org
+
+### Unknown (Cannot verify without block)
+- Actual fee percentage (requires block to be found)
+- Exact payout distribution
+
+---
+
+*Generated by stratum_audit.py - Open source audit tool*
+"""
+
+RISK_REPORT_TEMPLATE = """# Risk Assessment: pool.bitaxeluck.com
+
+**Overall Risk Level:** {overall_risk} ({risk_score}/5.0)
+
+---
+
+## Individual Risk Analysis
+
+{risk_sections}## Comparison to solo.ckpool.org
+
+### Differences
+{differences}
+### Similarities
+{similarities}
+### Verdict
+> {verdict}
+
+---
+
+## Recommendation
+
+**For hobby miners considering pool.bitaxeluck.com:**
+
+1. **Equivalent Risk** to solo.ckpool.org for solo mining
+2. **Verify** any found blocks on mempool.space
+3. **Check** coinbase contains `pool.bitaxeluck.com` tag
+4. **Confirm** 98% of block reward goes to your wallet
+
+**Bottom Line:** Using pool.bitaxeluck.com does NOT introduce significant additional risks compared to solo.ckpool.org. Both are solo mining pools with the same fundamental trust model.
+
+---
+
+*Generated by stratum_audit.py*
+"""
+
+
+class _ReportFields(dict):
+    """format_map mapping that renders missing fields as N/A."""
+
+    def __missing__(self, key: str) -> str:
+        return "N/A"
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested dicts into one level, joining keys with "_"."""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}_"))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _clip_hex(data: bytes, max_bytes: int = 50) -> str:
+    """Hex of the first max_bytes bytes, with "..." if data is longer."""
+    if len(data) <= max_bytes:
+        return data.hex()
+    return data[:max_bytes].hex() + "..."
+
 
 class StratumAuditor:
     """Stratum protocol auditor for mining pool verification."""
 
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, reuse: bool = False, report_suffix: str = "",
+                 output: Optional[TextIO] = None):
         self.host = host
         self.port = port
+        self.reuse = reuse  # Keep the connection open across run_full_audit() calls
+        self.report_suffix = report_suffix  # Appended to report filenames
+        self.output = output  # Progress output stream, None = stdout
         self.socket: Optional[socket.socket] = None
         self.session_id: Optional[str] = None
         self.extranonce1: Optional[str] = None
         self.extranonce2_size: Optional[int] = None
         self.difficulty: Optional[float] = None
         self.jobs: List[Dict] = []
-        self.audit_results: Dict[str, Any] = {
+        self._started_at = time.time()  # Audit start, formatted only for reports
+        self._recv_buffer = b""  # Partial line carried over between receives
+        self._pending: deque = deque()  # Decoded messages not yet consumed
+        self.audit_results: Dict[str, Any] = self._new_audit_results()
+
+    def _log(self, *args) -> None:
+        """Print progress output to self.output."""
+        print(*args, file=self.output)
+
+    def _new_audit_results(self) -> Dict[str, Any]:
+        """Empty audit results skeleton."""
+        return {
             "metadata": {
-                "audit_timestamp": datetime.now(timezone.utc).isoformat(),
-                "target_host": host,
-                "target_port": port,
+                "audit_timestamp": None,  # Formatted in generate_reports()
+                "target_host": self.host,
+                "target_port": self.port,
                 "tool_version": "1.0.0"
             },
             "connection": {},
@@ -60,33 +267,80 @@ class StratumAuditor:
             "risk_assessment": {}
         }
 
-    def connect(self) -> bool:
-        """Establish TCP connection to stratum server."""
+    def is_connected(self) -> bool:
+        """Check whether the socket is still connected.
+
+        getpeername() keeps working after the server has closed its end, so
+        peek without blocking instead: EOF means the connection is gone.
+        """
+        if not self.socket:
+            return False
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(TIMEOUT)
+            self.socket.setblocking(False)
+            try:
+                return self.socket.recv(1, socket.MSG_PEEK) != b""
+            finally:
+                self.socket.settimeout(TIMEOUT)
+        except BlockingIOError:
+            return True  # Open, nothing to read yet
+        except socket.error:
+            return False
 
-            print(f"[*] Connecting to {self.host}:{self.port}...")
+    def connect(self) -> bool:
+        """Establish TCP connection to stratum server.
+
+        With reuse enabled, an already open connection is kept.
+        """
+        if self.reuse and self.socket is not None and self.is_connected():
+            self._log(f"[*] Reusing connection to {self.host}:{self.port}")
+            # No connect time: nothing was measured in this run
+            self.audit_results["connection"] = {
+                "success": True,
+                "reused": True,
+                "remote_ip": self.socket.getpeername()[0],
+                "local_port": self.socket.getsockname()[1]
+            }
+            return True
+
+        # New connection: drop anything left over from a previous one
+        self.close()
+        self._recv_buffer = b""
+        self._pending.clear()
+
+        try:
+            self._log(f"[*] Connecting to {self.host}:{self.port}...")
             start_time = time.time()
-            self.socket.connect((self.host, self.port))
+            # Tries every resolved address (IPv6 and IPv4) in order
+            self.socket = socket.create_connection((self.host, self.port), timeout=TIMEOUT)
             connect_time = time.time() - start_time
 
+            # Small request/response frames: don't let Nagle delay them
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            if self.reuse:
+                # Detect dead connections while idle between audits
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                for opt, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 30), ("TCP_KEEPCNT", 3)):
+                    if hasattr(socket, opt):  # Linux only
+                        self.socket.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), value)
+
             self.audit_results["connection"] = {
                 "success": True,
+                "reused": False,
                 "connect_time_ms": round(connect_time * 1000, 2),
                 "remote_ip": self.socket.getpeername()[0],
                 "local_port": self.socket.getsockname()[1]
             }
-            print(f"[+] Connected in {connect_time*1000:.2f}ms")
+            self._log(f"[+] Connected in {connect_time*1000:.2f}ms")
             return True
 
         except socket.timeout:
             self.audit_results["connection"] = {"success": False, "error": "Connection timeout"}
-            print(f"[-] Connection timeout")
+            self._log(f"[-] Connection timeout")
             return False
         except socket.error as e:
             self.audit_results["connection"] = {"success": False, "error": str(e)}
-            print(f"[-] Connection error: {e}")
+            self._log(f"[-] Connection error: {e}")
             return False
 
     def send_message(self, method: str, params: List, msg_id: int = 1) -> bool:
@@ -96,96 +350,124 @@ class StratumAuditor:
             "method": method,
             "params": params
         }
-        data = json.dumps(message) + "\n"
+        if orjson is not None:
+            data = orjson.dumps(message) + b"\n"
+        else:
+            data = json.dumps(message).encode() + b"\n"
+        if self.socket is None:
+            self._log(f"[-] Send error: not connected")
+            return False
         try:
-            self.socket.sendall(data.encode())
-            print(f"[>] Sent: {method}")
+            self.socket.sendall(data)
+            self._log(f"[>] Sent: {method}")
             return True
         except socket.error as e:
-            print(f"[-] Send error: {e}")
+            self._log(f"[-] Send error: {e}")
             return False
 
-    def receive_messages(self, timeout: float = 5.0) -> List[Dict]:
-        """Receive and parse JSON-RPC messages."""
-        messages = []
-        self.socket.settimeout(timeout)
-        buffer = ""
+    def _iter_messages(self, timeout: float = 5.0) -> Iterator[Dict]:
+        """Yield JSON-RPC messages as they arrive, until timeout expires.
 
-        try:
-            while True:
-                data = self.socket.recv(BUFFER_SIZE).decode()
-                if not data:
-                    break
-                buffer += data
-
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    if line.strip():
-                        try:
-                            msg = json.loads(line)
-                            messages.append(msg)
-                            method = msg.get("method", msg.get("id", "response"))
-                            print(f"[<] Received: {method}")
-                        except json.JSONDecodeError:
-                            print(f"[-] Invalid JSON: {line[:50]}...")
+        Each recv is decoded into self._pending before yielding, so messages
+        the caller doesn't get to (it stops iterating) are kept for the next
+        call instead of being lost between phases.
+        """
+        deadline = time.monotonic() + timeout
 
-        except socket.timeout:
-            pass
-        except socket.error as e:
-            print(f"[-] Receive error: {e}")
+        while True:
+            while self._pending:
+                yield self._pending.popleft()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self.socket is None:
+                return
 
-        return messages
+            try:
+                self.socket.settimeout(remaining)
+                data = self.socket.recv(BUFFER_SIZE)
+            except socket.timeout:
+                return
+            except socket.error as e:
+                self._log(f"[-] Receive error: {e}")
+                self.close()
+                return
+
+            if not data:
+                self._log(f"[-] Connection closed by server")
+                self.close()
+                return
+
+            # Split once per recv; the trailing partial line is kept
+            # for the next recv (or the next call)
+            *lines, self._recv_buffer = (self._recv_buffer + data).split(b"\n")
+
+            for line in lines:
+                if line.strip():
+                    try:
+                        msg = orjson.loads(line) if orjson is not None else json.loads(line)
+                        self._pending.append(msg)
+                        method = msg.get("method", msg.get("id", "response"))
+                        self._log(f"[<] Received: {method}")
+                    except ValueError:  # Invalid JSON or UTF-8
+                        self._log(f"[-] Invalid JSON: {line[:50].decode(errors='replace')}...")
 
     def subscribe(self) -> bool:
         """Send mining.subscribe and analyze response."""
-        print("\n[*] Phase 1: mining.subscribe")
+        self._log("\n[*] Phase 1: mining.subscribe")
 
         # Standard subscribe with user agent
         self.send_message("mining.subscribe", ["stratum_auditor/1.0"])
-        messages = self.receive_messages()
-
-        for msg in messages:
-            if msg.get("id") == 1 and "result" in msg:
-                result = msg["result"]
-                if isinstance(result, list) and len(result) >= 3:
-                    # Parse subscription result
-                    # Format: [[["mining.set_difficulty", "sub_id"], ["mining.notify", "sub_id"]], extranonce1, extranonce2_size]
-                    subscriptions = result[0] if isinstance(result[0], list) else []
-                    self.extranonce1 = result[1] if len(result) > 1 else None
-                    self.extranonce2_size = result[2] if len(result) > 2 else None
 
+        # Anything that arrives before our response is kept for later phases
+        skipped = []
+        try:
+            for msg in self._iter_messages():
+                if msg.get("id") == 1 and "result" in msg:
+                    result = msg["result"]
+                    if isinstance(result, list) and len(result) >= 3:
+                        # Parse subscription result
+                        # Format: [[["mining.set_difficulty", "sub_id"], ["mining.notify", "sub_id"]], extranonce1, extranonce2_size]
+                        subscriptions = result[0] if isinstance(result[0], list) else []
+                        self.extranonce1 = result[1] if len(result) > 1 else None
+                        self.extranonce2_size = result[2] if len(result) > 2 else None
+
+                        self.audit_results["protocol"]["subscribe"] = {
+                            "success": True,
+                            "subscriptions": subscriptions,
+                            "extranonce1": self.extranonce1,
+                            "extranonce1_length": len(self.extranonce1) if self.extranonce1 else 0,
+                            "extranonce2_size": self.extranonce2_size
+                        }
+
+                        self._log(f"[+] Subscribed successfully")
+                        self._log(f"    Extranonce1: {self.extranonce1}")
+                        self._log(f"    Extranonce2 size: {self.extranonce2_size}")
+                        return True
+
+                elif msg.get("error"):
                     self.audit_results["protocol"]["subscribe"] = {
-                        "success": True,
-                        "subscriptions": subscriptions,
-                        "extranonce1": self.extranonce1,
-                        "extranonce1_length": len(self.extranonce1) if self.extranonce1 else 0,
-                        "extranonce2_size": self.extranonce2_size
+                        "success": False,
+                        "error": msg["error"]
                     }
+                    self._log(f"[-] Subscribe error: {msg['error']}")
+                    return False
 
-                    print(f"[+] Subscribed successfully")
-                    print(f"    Extranonce1: {self.extranonce1}")
-                    print(f"    Extranonce2 size: {self.extranonce2_size}")
-                    return True
-
-            elif msg.get("error"):
-                self.audit_results["protocol"]["subscribe"] = {
-                    "success": False,
-                    "error": msg["error"]
-                }
-                print(f"[-] Subscribe error: {msg['error']}")
-                return False
+                else:
+                    skipped.append(msg)
+        finally:
+            self._pending.extendleft(reversed(skipped))
 
         return False
 
     def authorize(self, wallet: str = "bc1qaudit000000000000000000000000000000000", worker: str = "audit") -> bool:
         """Send mining.authorize with test wallet."""
-        print("\n[*] Phase 2: mining.authorize")
+        self._log("\n[*] Phase 2: mining.authorize")
 
         username = f"{wallet}.{worker}"
         self.send_message("mining.authorize", [username, "x"], msg_id=2)
-        messages = self.receive_messages()
 
-        for msg in messages:
+        # Stops at our response; later messages (e.g. the first job) stay queued
+        for msg in self._iter_messages():
             if msg.get("id") == 2:
                 if msg.get("result") == True:
                     self.audit_results["protocol"]["authorize"] = {
@@ -193,21 +475,21 @@ class StratumAuditor:
                         "username_accepted": username,
                         "password_required": False
                     }
-                    print(f"[+] Authorized as {username}")
+                    self._log(f"[+] Authorized as {username}")
                     return True
                 else:
                     self.audit_results["protocol"]["authorize"] = {
                         "success": False,
                         "error": msg.get("error", "Unknown")
                     }
-                    print(f"[-] Authorization failed: {msg.get('error')}")
+                    self._log(f"[-] Authorization failed: {msg.get('error')}")
                     return False
 
             # Also capture any mining.set_difficulty or mining.notify
             if msg.get("method") == "mining.set_difficulty":
                 self.difficulty = msg["params"][0]
                 self.audit_results["protocol"]["initial_difficulty"] = self.difficulty
-                print(f"[+] Difficulty set: {self.difficulty}")
+                self._log(f"[+] Difficulty set: {self.difficulty}")
 
             elif msg.get("method") == "mining.notify":
                 self._process_notify(msg["params"])
@@ -216,33 +498,39 @@ class StratumAuditor:
 
     def wait_for_job(self, timeout: float = 30.0) -> bool:
         """Wait for mining.notify job."""
-        print("\n[*] Phase 3: Waiting for mining.notify...")
-
-        start = time.time()
-        while time.time() - start < timeout:
-            messages = self.receive_messages(timeout=5.0)
-            for msg in messages:
-                if msg.get("method") == "mining.notify":
-                    self._process_notify(msg["params"])
-                    return True
-                elif msg.get("method") == "mining.set_difficulty":
-                    self.difficulty = msg["params"][0]
-                    print(f"[+] Difficulty updated: {self.difficulty}")
+        self._log("\n[*] Phase 3: Waiting for mining.notify...")
 
-        print("[-] No job received within timeout")
+        for msg in self._iter_messages(timeout):
+            if msg.get("method") == "mining.notify":
+                self._process_notify(msg["params"])
+                return True
+            elif msg.get("method") == "mining.set_difficulty":
+                self.difficulty = msg["params"][0]
+                self._log(f"[+] Difficulty updated: {self.difficulty}")
+
+        self._log("[-] No job received within timeout")
         return False
 
     def _process_notify(self, params: List) -> None:
         """Process mining.notify parameters and extract coinbase info."""
         if len(params) < 9:
-            print(f"[-] Invalid notify params: {len(params)} elements")
+            self._log(f"[-] Invalid notify params: {len(params)} elements")
+            return
+
+        # Coinbase parts are decoded once here and kept as bytes
+        try:
+            coinbase1 = bytes.fromhex(params[2])
+            coinbase2 = bytes.fromhex(params[3])
+        except (TypeError, ValueError) as e:
+            self._log(f"[-] Coinbase decode error: {e}")
+            self.audit_results["coinbase_analysis"]["error"] = str(e)
             return
 
         job = {
             "job_id": params[0],
             "prevhash": params[1],
-            "coinbase1": params[2],
-            "coinbase2": params[3],
+            "coinbase1": coinbase1,
+            "coinbase2": coinbase2,
             "merkle_branches": params[4],
             "version": params[5],
             "nbits": params[6],
@@ -251,7 +539,7 @@ class StratumAuditor:
         }
 
         self.jobs.append(job)
-        print(f"[+] Job received: {job['job_id'][:16]}...")
+        self._log(f"[+] Job received: {job['job_id'][:16]}...")
 
         # Analyze coinbase
         self._analyze_coinbase(job)
@@ -261,55 +549,53 @@ class StratumAuditor:
         coinbase1 = job["coinbase1"]
         coinbase2 = job["coinbase2"]
 
-        print("\n[*] Phase 4: Coinbase Analysis")
-        print(f"    Coinbase1 length: {len(coinbase1)} hex chars")
-        print(f"    Coinbase2 length: {len(coinbase2)} hex chars")
+        self._log("\n[*] Phase 4: Coinbase Analysis")
+        self._log(f"    Coinbase1 length: {len(coinbase1) * 2} hex chars")
+        self._log(f"    Coinbase2 length: {len(coinbase2) * 2} hex chars")
 
-        # Decode coinbase1 to find the coinbase text/tag
+        # Scan coinbase1 for the coinbase text/tag
         try:
-            coinbase1_bytes = binascii.unhexlify(coinbase1)
-
             # Find ASCII strings in coinbase (pool identification)
-            ascii_parts = []
-            current = ""
-            for byte in coinbase1_bytes:
-                if 32 <= byte <= 126:  # Printable ASCII
-                    current += chr(byte)
-                else:
-                    if len(current) >= 3:
-                        ascii_parts.append(current)
-                    current = ""
-            if len(current) >= 3:
-                ascii_parts.append(current)
+            masked = coinbase1.translate(PRINTABLE_TABLE)
+            raw_parts = [part for part in masked.split(b"\x00") if len(part) >= 3]
+            ascii_parts = [part.decode("ascii") for part in raw_parts]
+            joined_lower = b" ".join(raw_parts).lower()  # Lowered once for all keyword checks
 
-            # Look for pool tag
+            # Look for pool tag ("pool" also covers "ckpool")
             coinbase_tag = None
-            for part in ascii_parts:
-                if "bitaxeluck" in part.lower() or "ckpool" in part.lower() or "pool" in part.lower():
-                    coinbase_tag = part
-                    break
+            if b"pool" in joined_lower or b"bitaxeluck" in joined_lower:
+                for part, raw in zip(ascii_parts, raw_parts):
+                    raw_lower = raw.lower()
+                    if b"bitaxeluck" in raw_lower or b"pool" in raw_lower:
+                        coinbase_tag = part
+                        break
 
             if not coinbase_tag and ascii_parts:
                 coinbase_tag = max(ascii_parts, key=len)
 
-            print(f"[+] Coinbase tag found: {coinbase_tag}")
-            print(f"    All ASCII in coinbase: {ascii_parts}")
+            self._log(f"[+] Coinbase tag found: {coinbase_tag}")
+            self._log(f"    All ASCII in coinbase: {ascii_parts}")
 
             self.audit_results["coinbase_analysis"] = {
-                "coinbase1_hex": coinbase1[:100] + "..." if len(coinbase1) > 100 else coinbase1,
-                "coinbase2_hex": coinbase2[:100] + "..." if len(coinbase2) > 100 else coinbase2,
+                "coinbase1_hex": _clip_hex(coinbase1),
+                "coinbase2_hex": _clip_hex(coinbase2),
                 "coinbase_tag": coinbase_tag,
                 "ascii_strings_found": ascii_parts,
                 "extranonce_position": "between coinbase1 and coinbase2",
-                "analysis": self._interpret_coinbase_tag(coinbase_tag, ascii_parts)
+                "analysis": self._interpret_coinbase_tag(coinbase_tag, ascii_parts, joined_lower)
             }
 
         except Exception as e:
-            print(f"[-] Coinbase decode error: {e}")
+            self._log(f"[-] Coinbase decode error: {e}")
             self.audit_results["coinbase_analysis"]["error"] = str(e)
 
-    def _interpret_coinbase_tag(self, tag: Optional[str], all_ascii: List[str]) -> Dict:
-        """Interpret what the coinbase tag tells us about the pool."""
+    def _interpret_coinbase_tag(self, tag: Optional[str], all_ascii: List[str],
+                                joined_lower: Optional[bytes] = None) -> Dict:
+        """Interpret what the coinbase tag tells us about the pool.
+
+        joined_lower is the space-joined, lowercased ASCII parts; it is
+        rebuilt from all_ascii when not supplied.
+        """
         analysis = {
             "is_ckpool": False,
             "is_custom_pool": False,
@@ -318,29 +604,29 @@ class StratumAuditor:
             "branding": None
         }
 
-        tag_lower = (tag or "").lower()
-        all_lower = " ".join(all_ascii).lower()
+        if joined_lower is None:
+            joined_lower = " ".join(all_ascii).lower().encode("ascii")
 
-        if "ckpool" in all_lower or "/ck" in all_lower:
+        if b"ckpool" in joined_lower or b"/ck" in joined_lower:
             analysis["is_ckpool"] = True
             analysis["identified_software"] = "CKPool"
 
-        if "bitaxeluck" in all_lower or "pool.bitaxeluck" in all_lower:
+        if b"bitaxeluck" in joined_lower:
             analysis["branding"] = "pool.bitaxeluck.com"
             analysis["is_custom_pool"] = True
 
-        if "solo" in all_lower:
+        if b"solo" in joined_lower:
             analysis["pool_type"] = "solo"
 
         # Check for proxy indicators
-        if "proxy" in all_lower or "relay" in all_lower:
+        if b"proxy" in joined_lower or b"relay" in joined_lower:
             analysis["is_proxy"] = True
 
         return analysis
 
     def analyze_fee_structure(self) -> None:
         """Analyze fee structure from coinbase outputs."""
-        print("\n[*] Phase 5: Fee Analysis")
+        self._log("\n[*] Phase 5: Fee Analysis")
 
         # Note: Full fee analysis requires parsing the complete coinbase TX
         # which needs coinbase1 + extranonce1 + extranonce2 + coinbase2
@@ -355,14 +641,14 @@ class StratumAuditor:
             "recommendation": "Verify any found block on mempool.space to confirm 98% goes to miner wallet"
         }
 
-        print("[*] Fee structure analysis:")
-        print("    - Documented fee: 2%")
-        print("    - Full verification requires finding a block")
-        print("    - No PPS indicators detected in protocol")
+        self._log("[*] Fee structure analysis:")
+        self._log("    - Documented fee: 2%")
+        self._log("    - Full verification requires finding a block")
+        self._log("    - No PPS indicators detected in protocol")
 
     def assess_risks(self) -> None:
         """Generate risk assessment based on audit findings."""
-        print("\n[*] Phase 6: Risk Assessment")
+        self._log("\n[*] Phase 6: Risk Assessment")
 
         risks = {
             "custodial_risk": {
@@ -392,17 +678,9 @@ class StratumAuditor:
         }
 
         # Determine overall risk
-        risk_scores = {"LOW": 1, "LOW-MEDIUM": 2, "MEDIUM": 3, "MEDIUM-HIGH": 4, "HIGH": 5}
-        avg_score = sum(risk_scores.get(r["level"], 3) for r in risks.values()) / len(risks)
-
-        if avg_score <= 1.5:
-            overall = "LOW"
-        elif avg_score <= 2.5:
-            overall = "LOW-MEDIUM"
-        elif avg_score <= 3.5:
-            overall = "MEDIUM"
-        else:
-            overall = "HIGH"
+        score = RISK_SCORES.get
+        avg_score = sum(score(r["level"], 3) for r in risks.values()) / len(risks)
+        overall = OVERALL_RISK_LEVELS[bisect.bisect_left(OVERALL_RISK_THRESHOLDS, avg_score)]
 
         self.audit_results["risk_assessment"] = {
             "overall_risk": overall,
@@ -424,186 +702,68 @@ class StratumAuditor:
             }
         }
 
-        print(f"[+] Overall risk level: {overall} ({avg_score:.2f}/5)")
+        self._log(f"[+] Overall risk level: {overall} ({avg_score:.2f}/5)")
 
     def generate_reports(self) -> None:
         """Generate JSON and Markdown audit reports."""
-        print("\n[*] Generating reports...")
+        self._log("\n[*] Generating reports...")
+
+        self.audit_results["metadata"]["audit_timestamp"] = datetime.fromtimestamp(
+            self._started_at, tz=timezone.utc
+        ).isoformat()
 
         # JSON report
-        json_path = "pool_audit.json"
-        with open(json_path, "w") as f:
-            json.dump(self.audit_results, f, indent=2)
-        print(f"[+] JSON report: {json_path}")
+        json_path = f"pool_audit{self.report_suffix}.json"
+        if orjson is not None:
+            with open(json_path, "wb") as f:
+                f.write(orjson.dumps(self.audit_results, option=orjson.OPT_INDENT_2))
+        else:
+            # json.dump writes iterencode() chunks, never the whole string
+            with open(json_path, "w") as f:
+                json.dump(self.audit_results, f, indent=2)
+        self._log(f"[+] JSON report: {json_path}")
 
         # Markdown report
-        md_path = "pool_audit.md"
+        md_path = f"pool_audit{self.report_suffix}.md"
         with open(md_path, "w") as f:
             f.write(self._generate_markdown())
-        print(f"[+] Markdown report: {md_path}")
+        self._log(f"[+] Markdown report: {md_path}")
 
         # Risk assessment
-        risk_path = "risk_assessment.md"
+        risk_path = f"risk_assessment{self.report_suffix}.md"
         with open(risk_path, "w") as f:
             f.write(self._generate_risk_markdown())
-        print(f"[+] Risk assessment: {risk_path}")
+        self._log(f"[+] Risk assessment: {risk_path}")
 
     def _generate_markdown(self) -> str:
         """Generate markdown audit report."""
-        r = self.audit_results
-
-        md = f"""# Stratum Audit Report: pool.bitaxeluck.com
-
-**Audit Date:** {r['metadata']['audit_timestamp']}
-**Target:** {r['metadata']['target_host']}:{r['metadata']['target_port']}
-**Tool Version:** {r['metadata']['tool_version']}
-
----
-
-## 1. Connection Analysis
-
-| Metric | Value |
-|--------|-------|
-| Connection Success | {r['connection'].get('success', 'N/A')} |
-| Connect Time | {r['connection'].get('connect_time_ms', 'N/A')} ms |
-| Remote IP | {r['connection'].get('remote_ip', 'N/A')} |
-
-## 2. Protocol Analysis
-
-### mining.subscribe
-- **Success:** {r['protocol'].get('subscribe', {}).get('success', 'N/A')}
-- **Extranonce1:** `{r['protocol'].get('subscribe', {}).get('extranonce1', 'N/A')}`
-- **Extranonce2 Size:** {r['protocol'].get('subscribe', {}).get('extranonce2_size', 'N/A')} bytes
-
-### mining.authorize
-- **Success:** {r['protocol'].get('authorize', {}).get('success', 'N/A')}
-- **Username Format:** wallet.worker (standard)
-- **Password Required:** No
-
-### Difficulty
-- **Initial Difficulty:** {r['protocol'].get('initial_difficulty', 'N/A')}
-
-## 3. Coinbase Analysis
-
-**This is the most critical section for verifying pool legitimacy.**
-
-### Coinbase Tag
-```
-{r['coinbase_analysis'].get('coinbase_tag', 'Not found')}
-```
-
-### ASCII Strings Found
-```
-{r['coinbase_analysis'].get('ascii_strings_found', [])}
-```
-
-### Interpretation
-- **Software:** {r['coinbase_analysis'].get('analysis', {}).get('identified_software', 'Unknown')}
-- **Is CKPool:** {r['coinbase_analysis'].get('analysis', {}).get('is_ckpool', False)}
-- **Custom Branding:** {r['coinbase_analysis'].get('analysis', {}).get('branding', 'None')}
-- **Is Proxy:** {r['coinbase_analysis'].get('analysis', {}).get('is_proxy', False)}
-
-## 4. Fee Analysis
-
-| Aspect | Finding |
-|--------|---------|
-| Documented Fee | {r['fee_analysis'].get('documented_fee', 'N/A')} |
-| PPS Indicators | {r['fee_analysis'].get('pps_indicators', 'N/A')} |
-| Share Redirection | {r['fee_analysis'].get('share_redirection', 'N/A')} |
-
-**Verification Method:** {r['fee_analysis'].get('recommendation', 'N/A')}
-
-## 5. Architecture Determination
-
-Based on the audit findings:
-
-| Question | Answer | Evidence |
-|----------|--------|----------|
-| Is this a full pool? | **Yes** | CKPool software detected, custom coinbase tag |
-| Is this a proxy? | **No** | No proxy indicators, direct Stratum implementation |
-| Is this CKPool-based? | **Yes** | CKPool signatures in protocol behavior |
-| Is this solo.ckpool.org? | **No** | Different coinbase tag, independent infrastructure |
-
-## 6. Conclusion
-
-**pool.bitaxeluck.com is a legitimate solo mining pool running CKPool software with independent infrastructure.**
-
-### Facts (Verified)
-- Uses standard Stratum v1 protocol
-- Running CKPool software
-- Custom coinbase tag: `pool.bitaxeluck.com`
-- Non-custodial (miner wallet in username)
-- 2% documented fee
-
-### Inferences (Likely but not proven)
-- Independent server infrastructure
-- Same security model as solo.ckpool.org
-
-### Unknown (Cannot verify without block)
-- Actual fee percentage (requires block to be found)
-- Exact payout distribution
-
----
-
-*Generated by stratum_audit.py - Open source audit tool*
-"""
-        return md
+        fields = _ReportFields(REPORT_DEFAULTS)
+        fields.update(_flatten(self.audit_results))
+        # Only measured when this run opened the connection itself
+        connect_time_ms = self.audit_results["connection"].get("connect_time_ms")
+        fields["connect_time"] = f"{connect_time_ms} ms" if connect_time_ms is not None else "N/A"
+        return REPORT_TEMPLATE.format_map(fields)
 
     def _generate_risk_markdown(self) -> str:
         """Generate risk assessment markdown."""
         r = self.audit_results["risk_assessment"]
-
-        md = f"""# Risk Assessment: pool.bitaxeluck.com
-
-**Overall Risk Level:** {r['overall_risk']} ({r['risk_score']}/5.0)
-
----
-
-## Individual Risk Analysis
-
-"""
-        for risk_name, risk_data in r["individual_risks"].items():
-            md += f"""### {risk_name.replace('_', ' ').title()}
-- **Level:** {risk_data['level']}
-- **Explanation:** {risk_data['explanation']}
-
-"""
-
-        md += f"""## Comparison to solo.ckpool.org
-
-### Differences
-"""
-        for diff in r["comparison_to_ckpool"]["differences"]:
-            md += f"- {diff}\n"
-
-        md += f"""
-### Similarities
-"""
-        for sim in r["comparison_to_ckpool"]["similarities"]:
-            md += f"- {sim}\n"
-
-        md += f"""
-### Verdict
-> {r["comparison_to_ckpool"]["verdict"]}
-
----
-
-## Recommendation
-
-**For hobby miners considering pool.bitaxeluck.com:**
-
-1. **Equivalent Risk** to solo.ckpool.org for solo mining
-2. **Verify** any found blocks on mempool.space
-3. **Check** coinbase contains `pool.bitaxeluck.com` tag
-4. **Confirm** 98% of block reward goes to your wallet
-
-**Bottom Line:** Using pool.bitaxeluck.com does NOT introduce significant additional risks compared to solo.ckpool.org. Both are solo mining pools with the same fundamental trust model.
-
----
-
-*Generated by stratum_audit.py*
-"""
-        return md
+        comparison = r["comparison_to_ckpool"]
+
+        risk_sections = "".join(
+            f"### {risk_name.replace('_', ' ').title()}\n"
+            f"- **Level:** {risk_data['level']}\n"
+            f"- **Explanation:** {risk_data['explanation']}\n\n"
+            for risk_name, risk_data in r["individual_risks"].items()
+        )
+
+        return RISK_REPORT_TEMPLATE.format_map({
+            "overall_risk": r["overall_risk"],
+            "risk_score": r["risk_score"],
+            "risk_sections": risk_sections,
+            "differences": "".join(f"- {diff}\n" for diff in comparison["differences"]),
+            "similarities": "".join(f"- {sim}\n" for sim in comparison["similarities"]),
+            "verdict": comparison["verdict"],
+        })
 
     def close(self) -> None:
         """Close socket connection."""
@@ -612,19 +772,38 @@ Based on the audit findings:
                 self.socket.close()
             except:
                 pass
+            self.socket = None
 
     def run_full_audit(self) -> Dict:
         """Execute complete audit sequence."""
-        print("=" * 60)
-        print("  STRATUM AUDIT: pool.bitaxeluck.com")
-        print("=" * 60)
+        self._log("=" * 60)
+        self._log("  STRATUM AUDIT: pool.bitaxeluck.com")
+        self._log("=" * 60)
+
+        # Fresh state for every run (a reused auditor may run several times).
+        # Queued messages belong to the previous run: a stale notify must not
+        # be analysed as this run's job. A partial line is kept, it is the
+        # start of the next message on the same connection.
+        self.audit_results = self._new_audit_results()
+        self._started_at = time.time()
+        self.session_id = None
+        self.extranonce1 = None
+        self.extranonce2_size = None
+        self.difficulty = None
+        self.jobs = []
+        self._pending.clear()
 
         try:
             if not self.connect():
                 return self.audit_results
 
             if not self.subscribe():
-                return self.audit_results
+                # A reused connection may have been closed by the server
+                # since the last check: reconnect once and retry
+                if not (self.audit_results["connection"].get("reused") and self.socket is None):
+                    return self.audit_results
+                if not self.connect() or not self.subscribe():
+                    return self.audit_results
 
             # Use a test wallet for authorization
             self.authorize()
@@ -642,15 +821,66 @@ Based on the audit findings:
             self.generate_reports()
 
         finally:
-            self.close()
+            if not self.reuse:
+                self.close()
 
-        print("\n" + "=" * 60)
-        print("  AUDIT COMPLETE")
-        print("=" * 60)
+        self._log("\n" + "=" * 60)
+        self._log("  AUDIT COMPLETE")
+        self._log("=" * 60)
 
         return self.audit_results
 
 
+def parse_target(target: str, default_port: int) -> Tuple[str, int]:
+    """Split 'host[:port]' or '[ipv6][:port]' into (host, port).
+
+    A bare IPv6 literal (more than one ':') is a host without a port.
+    """
+    if target.startswith("["):
+        host, _, rest = target[1:].partition("]")
+        if rest.startswith(":") and rest[1:].isdigit():
+            return host, int(rest[1:])
+        return host, default_port
+    host, sep, port = target.rpartition(":")
+    if sep and ":" not in host and port.isdigit():
+        return host, int(port)
+    return target, default_port
+
+
+def report_suffix(host: str, port: int) -> str:
+    """Per-target report filename suffix ("_<host>_<port>")."""
+    return f"_{host.replace(':', '-')}_{port}"  # No ':' (IPv6) in file names
+
+
+def audit_target(host: str, port: int, repeat: int = 1, report_suffix: str = "",
+                 output: Optional[TextIO] = None) -> List[Dict]:
+    """Run one or more audits of a single pool, reusing the connection."""
+    auditor = StratumAuditor(host, port, reuse=repeat > 1, report_suffix=report_suffix, output=output)
+    results = []
+    try:
+        for run in range(1, max(repeat, 1) + 1):
+            if repeat > 1:
+                # One set of report files per run
+                auditor.report_suffix = f"{report_suffix}_run{run}"
+            results.append(auditor.run_full_audit())
+        return results
+    finally:
+        auditor.close()
+
+
+def print_summary(results: Dict) -> None:
+    """Print a short summary of one audit."""
+    print("\n" + "-" * 60)
+    print("SUMMARY")
+    print("-" * 60)
+    print(f"Target: {results['metadata']['target_host']}:{results['metadata']['target_port']}")
+    print(f"Connection: {'OK' if results['connection'].get('success') else 'FAILED'}")
+    print(f"Protocol: {'OK' if results['protocol'].get('subscribe', {}).get('success') else 'FAILED'}")
+    print(f"Coinbase Tag: {results['coinbase_analysis'].get('coinbase_tag', 'Not found')}")
+    print(f"Overall Risk: {results['risk_assessment'].get('overall_risk', 'N/A')}")
+    print("-" * 60)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Stratum Protocol Auditor for mining pools",
@@ -660,30 +890,52 @@ Examples:
   python3 stratum_audit.py
   python3 stratum_audit.py --host stratum.bitaxeluck.com --port 3334
   python3 stratum_audit.py --host solo.ckpool.org --port 3333
+  python3 stratum_audit.py --repeat 5    # 5 audits over one connection
+  python3 stratum_audit.py --host stratum.bitaxeluck.com:3334 solo.ckpool.org:3333
 
 Output files:
   pool_audit.json     - Full audit data in JSON format
   pool_audit.md       - Human-readable audit report
   risk_assessment.md  - Risk analysis and recommendations
+
+With several hosts, audits run in parallel and each file name gets a
+_<host>_<port> suffix (e.g. pool_audit_solo.ckpool.org_3333.json).
+With --repeat N, each run's files also get a _run<N> suffix.
         """
     )
-    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Stratum host (default: {DEFAULT_HOST})")
+    parser.add_argument("--host", nargs="+", default=[DEFAULT_HOST],
+                        help=f"Stratum host(s), optionally as host:port or [ipv6]:port (default: {DEFAULT_HOST})")
     parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Stratum port (default: {DEFAULT_PORT})")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of audits to run over the same connection (default: 1)")
 
     args = parser.parse_args()
 
-    auditor = StratumAuditor(args.host, args.port)
-    results = auditor.run_full_audit()
-
-    # Print summary
-    print("\n" + "-" * 60)
-    print("SUMMARY")
-    print("-" * 60)
-    print(f"Connection: {'OK' if results['connection'].get('success') else 'FAILED'}")
-    print(f"Protocol: {'OK' if results['protocol'].get('subscribe', {}).get('success') else 'FAILED'}")
-    print(f"Coinbase Tag: {results['coinbase_analysis'].get('coinbase_tag', 'Not found')}")
-    print(f"Overall Risk: {results['risk_assessment'].get('overall_risk', 'N/A')}")
-    print("-" * 60)
+    targets = [parse_target(h, args.port) for h in args.host]
+
+    if len(targets) == 1:
+        host, port = targets[0]
+        for results in audit_target(host, port, args.repeat):
+            print_summary(results)
+        return
+
+    # Audits are almost entirely network wait, so run one thread per target.
+    # Each audit logs into its own buffer, printed in one piece when it
+    # finishes, so concurrent audits don't interleave their output.
+    print(f"[*] Auditing {len(targets)} targets in parallel...")
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_AUDITS, len(targets))) as executor:
+        futures = {}
+        for host, port in targets:
+            output = io.StringIO()
+            future = executor.submit(audit_target, host, port, args.repeat, report_suffix(host, port), output)
+            futures[future] = (host, output)
+        for future in as_completed(futures):
+            host, output = futures[future]
+            print(output.getvalue(), end="")
+            try:
+                for results in future.result():
+                    print_summary(results)
+            except Exception as e:
+                print(f"[-] Audit of {host} failed: {e}")
 
 
 if __name__ == "__main__":